@@ -2,13 +2,21 @@ from dataclasses import dataclass
 import numpy as np
 
 from .plotting import plot_TUD, plot_standoff
-from .rtm_simple import simulate_one, simulate_standoff_TUD
+from .rtm_simple import simulate_one, simulate_standoff_TUD, simulate_standoff_batch
+from .jacobian import simulate_jacobian, plan_jacobian_runs
 from .io_utils import (
     save_tud_npz,
     load_tud_npz,
     save_standoff_npz,
     load_standoff_npz,
+    save_tape6_archive,
+    load_tape6_archive,
+    save_tud_lut,
+    load_tud_lut,
 )
+from .ingest import ingest_tape6, read_tape6_cards
+from .convolution import convolve_spectra, check_line_shape, LINE_SHAPES
+from .compression import fit_spectral_basis, reconstruct_spectra, query_spectra
 
 @dataclass
 class TUDResult:
@@ -46,11 +54,40 @@ class StandoffTUDResult:
     h_top_km: float
     range_km: float
 
+@dataclass
+class TUDJacobianResult:
+    wavelength: np.ndarray
+    params: tuple               # parameter names, axis 1 of the Jacobians
+    transmittance: np.ndarray   # (n_base, n_wl)
+    upwelling: np.ndarray       # (n_base, n_wl) µflick
+    downwelling: np.ndarray     # (n_base, n_wl) µflick
+    dT: np.ndarray              # (n_base, n_params, n_wl)
+    dU: np.ndarray              # (n_base, n_params, n_wl) µflick / unit
+    dD: np.ndarray              # (n_base, n_params, n_wl) µflick / unit
+    n_runs: int                 # MODTRAN UP+DOWN pairs actually executed
+
+@dataclass
+class TUDCompressedLUT:
+    wavelength: np.ndarray
+    transmittance: dict         # fit_spectral_basis output (mean, basis, coeffs, errors)
+    upwelling: dict
+    downwelling: dict
+    T_surface: np.ndarray       # (n_cases,)
+    h2o_scale: np.ndarray       # (n_cases,)
+    o3_scale: np.ndarray        # (n_cases,)
+
 __all__ = [
     "run_TUD",
     "TUDResult",
     "run_standoff_TUD",
     "StandoffTUDResult",
+    "degrade_TUD",
+    "run_TUD_multires",
+    "run_standoff_batch",
+    "run_standoff_range_sweep",
+    "run_TUD_jacobian",
+    "TUDJacobianResult",
+    "plan_jacobian_runs",
     "set_modtran_dir",
     "plot_TUD",
     "plot_standoff",
@@ -58,6 +95,16 @@ __all__ = [
     "load_tud_npz",
     "save_standoff_npz",
     "load_standoff_npz",
+    "ingest_tape6",
+    "read_tape6_cards",
+    "save_tape6_archive",
+    "load_tape6_archive",
+    "TUDCompressedLUT",
+    "compress_TUD",
+    "reconstruct_TUD",
+    "query_TUD",
+    "save_tud_lut",
+    "load_tud_lut",
 ]
 
 
@@ -117,6 +164,94 @@ def run_TUD(
     )
 
 
+def degrade_TUD(
+    res: TUDResult,
+    fwhm: float,
+    shape: str = "gaussian",
+    native_fwhm: float | None = None,
+) -> TUDResult:
+    """
+    Convolve T, U and D of a TUDResult with an instrument line shape
+    ("gaussian", "triangular" or "rectangular") of FWHM fwhm (cm^-1).
+    The output stays on the input wavelength grid.
+    """
+    tud = np.stack([res.transmittance, res.upwelling, res.downwelling])
+    T, U, D = convolve_spectra(res.wavelength, tud, fwhm, shape=shape,
+                               native_fwhm=native_fwhm)
+
+    return TUDResult(
+        wavelength=res.wavelength,
+        transmittance=T,
+        upwelling=U,
+        downwelling=D,
+        T_surface=res.T_surface,
+        h2o_scale=res.h2o_scale,
+        o3_scale=res.o3_scale,
+    )
+
+
+def run_TUD_multires(
+    Tsurf: float,
+    fwhm: list[float],
+    shapes: tuple = ("gaussian",),
+    h2o_scale: float = 1.0,
+    o3_scale: float = 1.0,
+    h1: float | None = None,
+    h2: float | None = None,
+    sensor_center: float = 0.0,
+) -> dict:
+    """
+    Nadir TUD for several instrument resolutions from a single UP + DOWN run.
+
+    MODTRAN is run once at the finest FWHM of its band model
+    (rtm_simple.NATIVE_SENSOR_WIDTH), bypassing the MIN_SENSOR_WIDTH clamp
+    of run_TUD; every (shape, fwhm) target is then obtained by convolution.
+    Targets must be wider than that native width.
+
+    Returns a dict {(shape, fwhm): TUDResult}.
+    """
+    from . import rtm_simple
+
+    native = rtm_simple.NATIVE_SENSOR_WIDTH
+
+    # Reject bad targets before spending the MODTRAN runs
+    for shape in shapes:
+        for w in fwhm:
+            check_line_shape(shape, w, native_fwhm=native)
+
+    case_name = (
+        f"T{int(Tsurf)}_H{h2o_scale:.2f}_O{o3_scale:.2f}_NATIVE"
+    ).replace(".", "p")
+
+    sim = simulate_one(
+        Tsurf,
+        case_name,
+        h2o_scale=h2o_scale,
+        o3_scale=o3_scale,
+        h1=h1,
+        h2=h2,
+        sensor_center=sensor_center,
+        sensor_width=native,
+        clamp_width=False,
+    )
+
+    base = TUDResult(
+        wavelength=sim["wavelength"],
+        transmittance=sim["transmittance"],
+        upwelling=sim["up_microflicks"],
+        downwelling=sim["down_microflicks"],
+        T_surface=sim["T_surface"],
+        h2o_scale=sim["h2o_scale"],
+        o3_scale=sim["o3_scale"],
+    )
+
+    return {
+        (shape, w): degrade_TUD(base, w, shape=shape, native_fwhm=native)
+        for shape in shapes
+        for w in fwhm
+    }
+
+
 def run_standoff_TUD(
     h2o_scale: float = 1.0,
     o3_scale: float = 1.0,
@@ -169,3 +304,173 @@ def run_standoff_TUD(
         h2o_scale=h2o_scale,
         o3_scale=o3_scale,
     )
+
+
+def run_standoff_batch(cases: list[dict]) -> list[TUDResult]:
+    """
+    Run many standoff cases, sharing identical MODTRAN sub-runs.
+
+    Each case is a dict with the run_standoff_TUD arguments. The
+    range-independent downwelling run is executed once per
+    (h_sensor, h_ground, h2o_scale, o3_scale, sensor, T_surf) combination.
+
+    Returns one TUDResult per case, in input order.
+    """
+    sims = simulate_standoff_batch(cases)
+
+    return [
+        TUDResult(
+            wavelength=sim["wavelength"],
+            transmittance=sim["transmittance"],
+            upwelling=sim["up_microflicks"],
+            downwelling=sim["down_microflicks"],
+            T_surface=sim["T_surf"],
+            h2o_scale=sim["h2o_scale"],
+            o3_scale=sim["o3_scale"],
+        )
+        for sim in sims
+    ]
+
+
+def run_standoff_range_sweep(
+    range_km: list[float],
+    h2o_scale: float = 1.0,
+    o3_scale: float = 1.0,
+    h_sensor: float = 0.0015,
+    h_ground: float = 0.0,
+    sensor_center: float | None = None,
+    sensor_width: float | None = None,
+    T_surf: float = 1.0,
+) -> list[TUDResult]:
+    """
+    Standoff TUD for several ranges at a fixed height and atmosphere.
+
+    Runs the horizontal path once per range and the hemispheric
+    downwelling only once for the whole sweep (N + 1 MODTRAN runs
+    instead of 2N).
+    """
+    cases = [
+        dict(
+            h2o_scale=h2o_scale,
+            o3_scale=o3_scale,
+            h_sensor=h_sensor,
+            h_ground=h_ground,
+            range_km=r,
+            sensor_center=sensor_center,
+            sensor_width=sensor_width,
+            T_surf=T_surf,
+        )
+        for r in range_km
+    ]
+    return run_standoff_batch(cases)
+
+
+# ----------------------
+# Nadir TUD Jacobians
+# ----------------------
+
+def run_TUD_jacobian(
+    base_states: list[dict],
+    params: tuple = ("h2o_scale", "o3_scale", "Tsurf"),
+    steps: dict | None = None,
+    scheme: str = "forward",
+    sensor_center: float | None = None,
+    sensor_width: float | None = None,
+) -> TUDJacobianResult:
+    """
+    Jacobians dT/dp, dU/dp, dD/dp for a batch of nadir base states.
+
+    base_states is a list of dicts with the run_TUD arguments
+    (Tsurf, h2o_scale, o3_scale, h1, h2). Valid params are
+    "h2o_scale", "o3_scale", "Tsurf", "h1" and "h2".
+
+    Each distinct base/perturbed case is run only once across the batch.
+    Tsurf derivatives are analytic (surface-emission term) and cost
+    no extra MODTRAN runs.
+    """
+    sim = simulate_jacobian(
+        base_states,
+        params=params,
+        steps=steps,
+        scheme=scheme,
+        sensor_center=sensor_center,
+        sensor_width=sensor_width,
+    )
+
+    return TUDJacobianResult(
+        wavelength=sim["wavelength"],
+        params=sim["params"],
+        transmittance=sim["T"],
+        upwelling=sim["U"],
+        downwelling=sim["D"],
+        dT=sim["dT"],
+        dU=sim["dU"],
+        dD=sim["dD"],
+        n_runs=sim["n_runs"],
+    )
+
+
+# ----------------------
+# Compressed TUD look-up tables
+# ----------------------
+
+def compress_TUD(
+    results: list[TUDResult],
+    n_components: int | None = None,
+    tol: float = 1e-4,
+) -> TUDCompressedLUT:
+    """
+    PCA-compress a batch of TUDResult on a common wavelength grid.
+
+    One basis is learned per quantity (T, U, D). Per-case reconstruction
+    errors are stored as max_abs_error / rms_error in each quantity dict.
+    See fit_spectral_basis for n_components and tol.
+    """
+    lam = np.asarray(results[0].wavelength)
+    for r in results[1:]:
+        if r.wavelength.shape != lam.shape or not np.allclose(r.wavelength, lam):
+            raise ValueError("All results must share the same wavelength grid.")
+
+    def fit(attr):
+        X = np.stack([getattr(r, attr) for r in results])
+        return fit_spectral_basis(X, n_components=n_components, tol=tol)
+
+    return TUDCompressedLUT(
+        wavelength=lam,
+        transmittance=fit("transmittance"),
+        upwelling=fit("upwelling"),
+        downwelling=fit("downwelling"),
+        T_surface=np.array([r.T_surface for r in results], dtype=float),
+        h2o_scale=np.array([r.h2o_scale for r in results], dtype=float),
+        o3_scale=np.array([r.o3_scale for r in results], dtype=float),
+    )
+
+
+def reconstruct_TUD(lut: TUDCompressedLUT, index: int) -> TUDResult:
+    """
+    Expand case `index` of a compressed LUT back to a TUDResult.
+    """
+    return TUDResult(
+        wavelength=lut.wavelength,
+        transmittance=reconstruct_spectra(lut.transmittance, index),
+        upwelling=reconstruct_spectra(lut.upwelling, index),
+        downwelling=reconstruct_spectra(lut.downwelling, index),
+        T_surface=float(lut.T_surface[index]),
+        h2o_scale=float(lut.h2o_scale[index]),
+        o3_scale=float(lut.o3_scale[index]),
+    )
+
+
+def query_TUD(lut: TUDCompressedLUT, wavelength, index=None) -> dict:
+    """
+    T, U, D at selected wavelengths (µm, linear interpolation) for the
+    selected cases, without expanding the full spectra.
+
+    Returns a dict with "transmittance", "upwelling", "downwelling",
+    each of shape (n_sel, n_query), or (n_query,) for an int index.
+    Wavelengths outside the LUT grid raise ValueError.
+    """
+    return {
+        q: query_spectra(getattr(lut, q), lut.wavelength, wavelength, index)
+        for q in ("transmittance", "upwelling", "downwelling")
+    }
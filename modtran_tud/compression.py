@@ -0,0 +1,115 @@
+import numpy as np
+
+
+def fit_spectral_basis(spectra, n_components=None, tol=1e-4):
+    """
+    Learn a PCA basis for a batch of spectra and project them onto it.
+
+    Parameters
+    ----------
+    spectra : array (n_cases, n_wl)
+    n_components : int, optional
+        Number of basis vectors to keep. If None, the smallest number whose
+        relative RMS residual ||X - X_k|| / ||X - mean|| is <= tol is used.
+    tol : float
+        Relative RMS tolerance used when n_components is None.
+
+    Returns
+    -------
+    dict
+        mean          : (n_wl,)
+        basis         : (k, n_wl) orthonormal rows
+        coeffs        : (n_cases, k)
+        max_abs_error : (n_cases,) max |reconstruction - input| per case
+        rms_error     : (n_cases,) RMS reconstruction error per case
+    """
+    X = np.asarray(spectra, dtype=float)
+    if X.ndim != 2:
+        raise ValueError("spectra must be a 2-D array (n_cases, n_wl).")
+
+    if n_components is not None and n_components < 0:
+        raise ValueError("n_components must be >= 0.")
+
+    mean = X.mean(axis=0)
+    U, S, Vt = np.linalg.svd(X - mean, full_matrices=False)
+
+    if n_components is None:
+        energy = S**2
+        total = energy.sum()
+        if total == 0.0:
+            k = 0
+        else:
+            # residual[k] = relative energy left after keeping k components
+            residual = np.sqrt(np.maximum(1.0 - np.cumsum(energy) / total, 0.0))
+            k = int(np.searchsorted(-residual, -tol) + 1)
+            k = min(k, S.size)
+    else:
+        k = int(min(n_components, S.size))
+
+    basis = Vt[:k]
+    coeffs = U[:, :k] * S[:k]
+
+    err = X - (mean + coeffs @ basis)
+
+    return {
+        "mean": mean,
+        "basis": basis,
+        "coeffs": coeffs,
+        "max_abs_error": np.abs(err).max(axis=1),
+        "rms_error": np.sqrt((err**2).mean(axis=1)),
+    }
+
+
+def reconstruct_spectra(comp, index=None):
+    """
+    Full spectra from a compressed representation.
+
+    index selects cases (int, slice or array); default all.
+    Returns (n_wl,) for an int index, (n_sel, n_wl) otherwise.
+    """
+    coeffs = comp["coeffs"] if index is None else comp["coeffs"][index]
+    return comp["mean"] + coeffs @ comp["basis"]
+
+
+def _interp_weights(wavelength, lam_query):
+    """
+    Indices and weights of the linear interpolation of `wavelength`
+    (monotonic, either direction) at lam_query.
+    """
+    lam = np.asarray(wavelength, dtype=float)
+    q = np.atleast_1d(np.asarray(lam_query, dtype=float))
+
+    order = np.argsort(lam)
+    lam_s = lam[order]
+
+    outside = (q < lam_s[0]) | (q > lam_s[-1])
+    if np.any(outside):
+        raise ValueError(
+            f"Query wavelengths {q[outside].tolist()} are outside the grid "
+            f"[{lam_s[0]:.4f}, {lam_s[-1]:.4f}] µm."
+        )
+
+    j = np.clip(np.searchsorted(lam_s, q) - 1, 0, lam_s.size - 2)
+    x0, x1 = lam_s[j], lam_s[j + 1]
+    w = np.clip((q - x0) / (x1 - x0), 0.0, 1.0)
+
+    return order[j], order[j + 1], w
+
+
+def query_spectra(comp, wavelength, lam_query, index=None):
+    """
+    Spectra at selected wavelengths without expanding the full spectrum.
+
+    Only the mean and basis columns around lam_query (µm) are interpolated,
+    so the cost is O(n_cases · k · n_query). Queries outside the
+    wavelength grid raise ValueError.
+
+    Returns (n_sel, n_query) (or (n_query,) for an int index).
+    """
+    i0, i1, w = _interp_weights(wavelength, lam_query)
+
+    mean_q = (1.0 - w) * comp["mean"][i0] + w * comp["mean"][i1]
+    basis_q = (1.0 - w) * comp["basis"][:, i0] + w * comp["basis"][:, i1]
+
+    coeffs = comp["coeffs"] if index is None else comp["coeffs"][index]
+    return mean_q + coeffs @ basis_q
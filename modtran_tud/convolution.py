@@ -0,0 +1,112 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+# Tolerance (in units of FWHM) when comparing |x| against a kernel edge:
+# wavenumbers come from 1e4/λ and are not exact multiples of the grid step
+_EDGE_TOL = 1e-6
+
+
+def _rectangular(x):
+    """Boxcar with half-weight samples on its edges (trapezoidal rule)."""
+    ax = np.abs(x)
+    return np.where(ax < 0.5 - _EDGE_TOL, 1.0,
+                    np.where(ax <= 0.5 + _EDGE_TOL, 0.5, 0.0))
+
+
+def _triangular(x):
+    """Triangle of half-width FWHM; samples on its zero edges are dropped."""
+    ax = np.abs(x)
+    return np.where(ax < 1.0 - _EDGE_TOL, 1.0 - ax, 0.0)
+
+
+# Instrument line shapes, as functions of x = (ν - ν0) / FWHM.
+# Each is zero outside its half support (in units of FWHM).
+LINE_SHAPES = {
+    "gaussian":    (lambda x: np.exp(-4.0 * np.log(2.0) * x**2), 3.0),
+    "triangular":  (_triangular, 1.0),
+    "rectangular": (_rectangular, 0.5),
+}
+
+
+def check_line_shape(shape, fwhm, native_fwhm=None):
+    """
+    Validate a (shape, fwhm) target and return the FWHM of the kernel to
+    apply (see _kernel_fwhm). Raises ValueError for unknown shapes,
+    non-positive widths and targets not wider than native_fwhm.
+    """
+    if shape not in LINE_SHAPES:
+        raise ValueError(
+            f"Unknown line shape '{shape}'. Valid options: {tuple(LINE_SHAPES)}"
+        )
+    if fwhm <= 0:
+        raise ValueError("fwhm must be positive.")
+    return _kernel_fwhm(fwhm, native_fwhm)
+
+
+def _kernel_fwhm(fwhm, native_fwhm):
+    """
+    Width of the kernel to apply so that the output has resolution fwhm
+    when the input already has native_fwhm (quadrature subtraction,
+    exact for Gaussians, approximate for other shapes).
+    """
+    if native_fwhm is None:
+        return float(fwhm)
+    if fwhm <= native_fwhm:
+        raise ValueError(
+            f"Target FWHM {fwhm} cm^-1 must be larger than the native "
+            f"resolution of the run ({native_fwhm} cm^-1)."
+        )
+    return float(np.sqrt(fwhm**2 - native_fwhm**2))
+
+
+@lru_cache(maxsize=64)
+def _convolution_matrix(freq_bytes, n, fwhm, shape):
+    freq = np.frombuffer(freq_bytes, dtype=float, count=n)
+    func, support = LINE_SHAPES[shape]
+
+    x = (freq[None, :] - freq[:, None]) / fwhm
+    K = np.where(np.abs(x) <= support + _EDGE_TOL, func(x), 0.0)
+
+    # Trapezoid-like weights for (possibly) non-uniform grids
+    dnu = np.abs(np.gradient(freq)) if n > 1 else np.ones(1)
+    K *= dnu[None, :]
+
+    # Normalize each row: truncated kernels at the band edges still sum to 1
+    K /= K.sum(axis=1, keepdims=True)
+    K.setflags(write=False)
+    return K
+
+
+def convolution_matrix(wavelength, fwhm, shape="gaussian"):
+    """
+    Row-normalized (n, n) matrix applying an instrument line shape of the
+    given FWHM (cm^-1) on the wavenumber grid of `wavelength` (µm).
+
+    Matrices are cached per (grid, FWHM, shape), so repeated calls on the
+    same MODTRAN grid are free.
+    """
+    check_line_shape(shape, fwhm)
+
+    freq = np.ascontiguousarray(1e4 / np.asarray(wavelength, dtype=float))
+    return _convolution_matrix(freq.tobytes(), freq.size, float(fwhm), shape)
+
+
+def convolve_spectra(wavelength, spectra, fwhm, shape="gaussian",
+                     native_fwhm=None):
+    """
+    Degrade spectra on the `wavelength` grid (µm) to a line shape of
+    FWHM `fwhm` (cm^-1).
+
+    spectra : array (..., n_wl)
+        Any number of stacked spectra, convolved with one matrix product.
+    native_fwhm : float, optional
+        Resolution of the input run (cm^-1). When given, the kernel is
+        narrowed so that the result has (approximately) the target FWHM.
+
+    Returns an array with the same shape as `spectra`.
+    """
+    K = convolution_matrix(wavelength,
+                           check_line_shape(shape, fwhm, native_fwhm), shape)
+    return np.asarray(spectra, dtype=float) @ K.T
@@ -0,0 +1,273 @@
+import os
+import re
+import glob
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .rtm_simple import parse_tape6
+
+
+# Suffixes appended to case names by simulate_one / simulate_standoff_TUD
+RUN_KINDS = ("STANDUP", "STANDD", "UP", "DOWN")
+
+# Run parameters recovered from the TAPE6 echo of the input cards
+CARD_FIELDS = (
+    "itype", "Tsurf", "surref",
+    "h2o_scale", "o3_scale",
+    "h1", "h2", "angle", "range_km",
+    "v1", "v2", "sensor_center", "sensor_width",
+)
+
+# Spectral columns stacked into the consolidated dataset
+SPECTRAL_FIELDS = (
+    "freq", "wavelength", "transmittance",
+    "total_radiance", "path_thermal", "scat_part",
+    "surface_emission", "surface_reflected",
+)
+
+_CARD_RE = re.compile(r"^\s*CARD\s+(\w+)\s*\*+(.*)$", re.MULTILINE)
+
+
+def _to_float(s):
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _fixed_fields(card, n, width=10):
+    """
+    First n fixed-width Fortran F fields of a card image. Blank fields
+    read as 0, as in Fortran. Returns None if any field is not a number.
+    """
+    values = []
+    for i in range(n):
+        field = card[i * width:(i + 1) * width].strip()
+        value = 0.0 if not field else _to_float(field)
+        if np.isnan(value):
+            return None
+        values.append(value)
+    return values
+
+
+def _free_fields(card, n):
+    """First n whitespace-separated fields of a card image (NaN if missing)."""
+    tok = card.split()
+    return [_to_float(tok[i]) if i < len(tok) else np.nan for i in range(n)]
+
+
+# build_tape5 writes TPTEMP with 2 decimals followed by the SURREF literal
+# of the template, which shifts both off their F8.3/A7 columns
+_TEMPLATE_TPTEMP_RE = re.compile(r"^([-+]?\d+\.\d{2})(\d*\.?\d*)$")
+
+# A genuine F8.3 TPTEMP field
+_F83_RE = re.compile(r"^\s*[-+]?\d*\.\d{3}$")
+
+
+def _card1_tail(card):
+    """(TPTEMP, SURREF) from the end of CARD 1 (columns 66-80)."""
+    tail = card[65:].strip()
+
+    # free format
+    tok = tail.split()
+    if len(tok) == 2:
+        return _to_float(tok[0]), _to_float(tok[1])
+
+    # standard F8.3, A7 columns
+    if _F83_RE.match(card[65:73]):
+        surref = _to_float(card[73:80])
+        if not np.isnan(surref):
+            return _to_float(card[65:73]), surref
+
+    # shifted layout produced by the templates in modtran_tud/templates
+    m = _TEMPLATE_TPTEMP_RE.match(tail)
+    if m:
+        return _to_float(m.group(1)), _to_float(m.group(2))
+
+    return np.nan, np.nan
+
+
+def read_tape6_cards(path):
+    """
+    Recover the run parameters from the input-card echo of a TAPE6.
+
+    MODTRAN echoes every card as
+
+        CARD 1   *****<card image>
+
+    CARD 1/1A are read at their fixed columns (with a fallback for the
+    shifted TPTEMP/SURREF written by the package templates). CARD 3/4 are
+    read as 4F10 fields, falling back to free format for template decks
+    whose values overflow the 10-column fields.
+
+    h1/h2 are the MODTRAN observer/final altitudes of CARD 3. Fields that
+    cannot be read are returned as NaN.
+    """
+    with open(path, "r", encoding="latin-1", errors="replace") as f:
+        text = f.read()
+
+    cards = {}
+    for m in _CARD_RE.finditer(text):
+        # keep the first echo of each card (the input deck)
+        cards.setdefault(m.group(1).upper(), m.group(2))
+
+    out = {k: np.nan for k in CARD_FIELDS}
+
+    c1 = cards.get("1")
+    if c1 is not None:
+        # MODTRN, SPEED, BINARY, LYMOLC, MODEL (A1 x 4, I1), T_BEST A1,
+        # ITYPE I4, 11 x I5, TPTEMP F8.3, SURREF A7
+        out["itype"] = _to_float(c1[6:10])
+        out["Tsurf"], out["surref"] = _card1_tail(c1)
+
+    c1a = cards.get("1A")
+    if c1a is not None:
+        # DIS..DISALB (3), NSTR I3, SFWHM F4, CO2MX F10, H2OSTR A10, O3STR A10
+        out["h2o_scale"] = _to_float(c1a[20:30])
+        out["o3_scale"] = _to_float(c1a[30:40])
+
+    for card, names in (("3", ("h1", "h2", "angle", "range_km")),
+                        ("4", ("v1", "v2", "sensor_center", "sensor_width"))):
+        image = cards.get(card)
+        if image is None:
+            continue
+        values = _fixed_fields(image, 4) or _free_fields(image, 4)
+        out.update(zip(names, values))
+
+    return out
+
+
+def _run_kind(path):
+    """
+    (case_name, kind) from a file name written by run_modtran, e.g.
+    T300_H1p00_O1p00_UP.tp6 -> ("T300_H1p00_O1p00", "UP").
+    Files with other names (e.g. from PcModWin) get kind "".
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for kind in RUN_KINDS:
+        if stem.endswith("_" + kind):
+            return stem[: -len(kind) - 1], kind
+    return stem, ""
+
+
+def find_tape6_files(paths, patterns=("*.tp6", "*.TP6", "TAPE6"),
+                     recursive=True):
+    """
+    List TAPE6 files under one or more directories (or explicit files),
+    sorted and without duplicates.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+
+    found = set()
+    for p in paths:
+        p = os.fspath(p)
+        if os.path.isfile(p):
+            found.add(os.path.abspath(p))
+            continue
+        for pat in patterns:
+            sub = os.path.join(p, "**", pat) if recursive else os.path.join(p, pat)
+            for f in glob.glob(sub, recursive=recursive):
+                if os.path.isfile(f):
+                    found.add(os.path.abspath(f))
+
+    return sorted(found)
+
+
+def _ingest_one(path):
+    """
+    Worker: parse one TAPE6. Must stay at module level to be picklable.
+    Returns (path, record) or (path, error message).
+    """
+    try:
+        res = parse_tape6(path)
+        params = read_tape6_cards(path)
+    except (OSError, RuntimeError, ValueError, KeyError) as e:
+        return path, f"{type(e).__name__}: {e}"
+
+    case_name, kind = _run_kind(path)
+    if kind == "DOWN":
+        # tape5_template_down writes H2 H1 (upward-looking path):
+        # map back to the run_TUD meaning of h1/h2
+        params["h1"], params["h2"] = params["h2"], params["h1"]
+
+    record = {k: np.asarray(res[k], dtype=float) for k in SPECTRAL_FIELDS}
+    record.update(params)
+    record["case_name"] = case_name
+    record["kind"] = kind
+    return path, record
+
+
+def ingest_tape6(paths, workers=None, chunksize=8, recursive=True):
+    """
+    Parse many TAPE6 files in parallel into one consolidated dataset.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        Directories (scanned for .tp6 / TAPE6 files) or individual files.
+    workers : int, optional
+        Number of worker processes (default: os.cpu_count()).
+        Use workers=1 to parse in the current process.
+    chunksize : int
+        Files sent to a worker at once.
+
+    Returns
+    -------
+    dict
+        path, case_name, kind : (n_files,) string arrays
+        n_points              : (n_files,) number of spectral points
+        <SPECTRAL_FIELDS>     : (n_files, n_max) float arrays, NaN-padded.
+                                total_radiance is in microflicks;
+                                path_thermal, scat_part, surface_emission
+                                and surface_reflected are in W/cm2-sr-µm,
+                                as returned by simulate_one
+        <CARD_FIELDS>         : (n_files,) float arrays, NaN if not echoed.
+                                For files written by this package
+                                (kind != ""), h1/h2 follow run_TUD; for
+                                other files they are the MODTRAN
+                                observer/final altitudes of CARD 3
+        failed                : list of (path, error) for unreadable files
+
+    NOTE:
+      On Windows, multiprocessing requires calling this from under an
+      `if __name__ == "__main__":` guard.
+    """
+    files = find_tape6_files(paths, recursive=recursive)
+
+    if workers == 1 or len(files) <= 1:
+        results = [_ingest_one(f) for f in files]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_ingest_one, files, chunksize=chunksize))
+
+    records = [(p, r) for p, r in results if isinstance(r, dict)]
+    failed = [(p, r) for p, r in results if not isinstance(r, dict)]
+
+    n = len(records)
+    n_points = np.array([r["wavelength"].size for _, r in records], dtype=int)
+    n_max = int(n_points.max()) if n else 0
+
+    data = {
+        "path": np.array([p for p, _ in records], dtype=str),
+        "case_name": np.array([r["case_name"] for _, r in records], dtype=str),
+        "kind": np.array([r["kind"] for _, r in records], dtype=str),
+        "n_points": n_points,
+    }
+
+    for key in SPECTRAL_FIELDS:
+        arr = np.full((n, n_max), np.nan)
+        for i, (_, r) in enumerate(records):
+            arr[i, : n_points[i]] = r[key]
+        data[key] = arr
+
+    # Total radiance in microflicks, like up_microflicks/down_microflicks
+    # of simulate_one; the components stay in W/cm2-sr-µm as there
+    data["total_radiance"] *= 1e6
+
+    for key in CARD_FIELDS:
+        data[key] = np.array([r[key] for _, r in records], dtype=float)
+
+    data["failed"] = failed
+    return data
@@ -74,3 +74,70 @@ def load_standoff_npz(path: str):
         h_top_km=float(data["h_top_km"]),
         range_km=float(data["range_km"]),
     )
+
+
+def save_tape6_archive(data, path: str) -> None:
+    """
+    Save a dataset returned by ingest_tape6 to a compressed .npz file.
+    """
+    arrays = {k: v for k, v in data.items() if k != "failed"}
+    failed = data.get("failed", [])
+    arrays["failed_path"] = np.array([p for p, _ in failed], dtype=str)
+    arrays["failed_error"] = np.array([e for _, e in failed], dtype=str)
+    np.savez_compressed(path, **arrays)
+
+
+def load_tape6_archive(path: str) -> dict:
+    """
+    Load a dataset previously saved with save_tape6_archive.
+    """
+    with np.load(path) as npz:
+        data = {k: npz[k] for k in npz.files}
+
+    data["failed"] = list(zip(data.pop("failed_path").tolist(),
+                              data.pop("failed_error").tolist()))
+    return data
+
+
+_LUT_QUANTITIES = ("transmittance", "upwelling", "downwelling")
+_LUT_FIELDS = ("mean", "basis", "coeffs", "max_abs_error", "rms_error")
+
+
+def save_tud_lut(lut, path: str) -> None:
+    """
+    Save a TUDCompressedLUT object to a compressed .npz file.
+    """
+    arrays = {
+        f"{q}_{k}": getattr(lut, q)[k]
+        for q in _LUT_QUANTITIES
+        for k in _LUT_FIELDS
+    }
+    np.savez_compressed(
+        path,
+        wavelength=lut.wavelength,
+        T_surface=lut.T_surface,
+        h2o_scale=lut.h2o_scale,
+        o3_scale=lut.o3_scale,
+        **arrays,
+    )
+
+
+def load_tud_lut(path: str):
+    """
+    Load a TUDCompressedLUT object from a .npz file previously saved
+    with save_tud_lut.
+    """
+    from . import TUDCompressedLUT  # avoid circular import
+
+    data = np.load(path)
+    bases = {
+        q: {k: data[f"{q}_{k}"] for k in _LUT_FIELDS}
+        for q in _LUT_QUANTITIES
+    }
+    return TUDCompressedLUT(
+        wavelength=data["wavelength"],
+        T_surface=data["T_surface"],
+        h2o_scale=data["h2o_scale"],
+        o3_scale=data["o3_scale"],
+        **bases,
+    )
@@ -0,0 +1,303 @@
+import numpy as np
+
+from . import rtm_simple
+
+
+# Order of the fields that define one nadir MODTRAN case (UP + DOWN pair)
+STATE_KEYS = ("Tsurf", "h2o_scale", "o3_scale", "h1", "h2")
+
+# Decimals each field gets in the TAPE5 (see build_tape5). States are
+# rounded to this precision so that cases MODTRAN cannot tell apart
+# share one run.
+STATE_DECIMALS = (2, 3, 3, 6, 6)
+
+# Parameters a Jacobian can be requested for
+JACOBIAN_PARAMS = ("h2o_scale", "o3_scale", "Tsurf", "h1", "h2")
+
+# Parameters handled analytically (no extra MODTRAN runs)
+ANALYTIC_PARAMS = ("Tsurf",)
+
+# Default absolute finite-difference steps.
+# They must survive the TAPE5 formatting in build_tape5
+# (scales with 3 decimals, altitudes in km with 6 decimals).
+DEFAULT_STEPS = {
+    "h2o_scale": 0.01,
+    "o3_scale":  0.01,
+    "h1":        0.01,     # km
+    "h2":        0.0005,   # km
+}
+
+# Second radiation constant hc/k [µm·K]
+C2_UM_K = 14387.769
+
+
+def planck_dlnB_dT(wavelength_um, T):
+    """
+    Logarithmic temperature derivative of the Planck function,
+
+        d ln B(λ, T) / dT = (c2 / (λ T²)) · e^x / (e^x - 1),   x = c2 / (λ T)
+
+    wavelength_um in µm, T in K. Returns 1/K.
+    """
+    lam = np.asarray(wavelength_um, dtype=float)
+    x = C2_UM_K / (lam * T)
+    return (x / T) / -np.expm1(-x)
+
+
+def _normalize_state(state):
+    """
+    Fill a base state dict with the run_TUD defaults and return it
+    as a tuple ordered like STATE_KEYS.
+    """
+    if "Tsurf" not in state:
+        raise ValueError("Every base state needs a 'Tsurf' entry.")
+
+    unknown = set(state) - set(STATE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown base state keys: {sorted(unknown)}")
+
+    values = (
+        state["Tsurf"],
+        state.get("h2o_scale", 1.0),
+        state.get("o3_scale", 1.0),
+        state.get("h1"),
+        state.get("h2"),
+    )
+    return tuple(
+        None if v is None else round(float(v), n)
+        for v, n in zip(values, STATE_DECIMALS)
+    )
+
+
+def _perturb(key, param, delta):
+    """Return a copy of the state tuple with `param` shifted by delta."""
+    i = STATE_KEYS.index(param)
+    values = list(key)
+    values[i] = round(values[i] + delta, STATE_DECIMALS[i])
+    return tuple(values)
+
+
+def _case_name(prefix, key, sensor_center=None, sensor_width=None):
+    """
+    File-name friendly case name encoding a state tuple at TAPE5 precision,
+    so runs from different batches do not overwrite each other's TAPE6.
+    """
+    Tsurf, h2o, o3, h1, h2 = key
+    name = f"{prefix}_T{Tsurf:.2f}_H{h2o:.3f}_O{o3:.3f}"
+    if h1 is not None:
+        name += f"_A{h1:.6f}"
+    if h2 is not None:
+        name += f"_B{h2:.6f}"
+    if sensor_center is not None:
+        name += f"_C{sensor_center:.5f}"
+    if sensor_width is not None:
+        name += f"_W{sensor_width:.5f}"
+    return name.replace(".", "p").replace("-", "m")
+
+
+# -------------------------------
+# 1) Plan the runs
+# -------------------------------
+def plan_jacobian_runs(base_states, params=("h2o_scale", "o3_scale", "Tsurf"),
+                       steps=None, scheme="forward"):
+    """
+    Plan the MODTRAN cases needed for the Jacobians of many base states.
+
+    Every distinct case (base or perturbed) appears only once in the plan,
+    so base states that share perturbed neighbours also share the runs.
+
+    Parameters
+    ----------
+    base_states : list of dict
+        Each dict has 'Tsurf' and optionally 'h2o_scale', 'o3_scale',
+        'h1', 'h2' (same meaning as in run_TUD).
+    params : sequence of str
+        Subset of JACOBIAN_PARAMS.
+    steps : dict, optional
+        Absolute step per parameter (overrides DEFAULT_STEPS).
+    scheme : {"forward", "central"}
+        Central differences fall back to forward when the backward step
+        would give a negative altitude or scale.
+
+    Returns
+    -------
+    dict
+        runs        : list of unique state tuples (ordered like STATE_KEYS)
+        base_index  : index into runs of each base state
+        stencils    : stencils[b][p] = (i_plus, i_minus, delta) or None for
+                      analytic parameters
+        params      : tuple of parameter names
+    """
+    if scheme not in ("forward", "central"):
+        raise ValueError("scheme must be 'forward' or 'central'.")
+
+    base_states = list(base_states)
+    if not base_states:
+        raise ValueError("base_states is empty: nothing to differentiate.")
+
+    params = tuple(params)
+    for p in params:
+        if p not in JACOBIAN_PARAMS:
+            raise ValueError(
+                f"Unknown Jacobian parameter '{p}'. "
+                f"Valid options: {JACOBIAN_PARAMS}"
+            )
+
+    step_of = dict(DEFAULT_STEPS)
+    if steps is not None:
+        step_of.update(steps)
+
+    runs = []
+    index = {}
+
+    def add(key):
+        if key not in index:
+            index[key] = len(runs)
+            runs.append(key)
+        return index[key]
+
+    base_index = []
+    stencils = []
+
+    for state in base_states:
+        key = _normalize_state(state)
+        i_base = add(key)
+        base_index.append(i_base)
+
+        row = []
+        for p in params:
+            if p in ANALYTIC_PARAMS:
+                row.append(None)
+                continue
+
+            x = key[STATE_KEYS.index(p)]
+            if x is None:
+                raise ValueError(
+                    f"Parameter '{p}' requested but not set in base state {state}."
+                )
+
+            h = float(step_of[p])
+            plus = _perturb(key, p, h)
+            if plus == key:
+                raise ValueError(
+                    f"Step {h} for '{p}' is below the TAPE5 precision."
+                )
+            i_plus = add(plus)
+
+            # delta is taken from the rounded values MODTRAN actually sees
+            i_par = STATE_KEYS.index(p)
+            if scheme == "central" and x - h >= 0.0:
+                minus = _perturb(key, p, -h)
+                i_minus = add(minus)
+                row.append((i_plus, i_minus, plus[i_par] - minus[i_par]))
+            else:
+                row.append((i_plus, i_base, plus[i_par] - x))
+        stencils.append(row)
+
+    return {
+        "runs": runs,
+        "base_index": base_index,
+        "stencils": stencils,
+        "params": params,
+    }
+
+
+# -------------------------------
+# 2) Run the plan and assemble Jacobians
+# -------------------------------
+def simulate_jacobian(
+    base_states,
+    params=("h2o_scale", "o3_scale", "Tsurf"),
+    steps=None,
+    scheme="forward",
+    sensor_center=None,
+    sensor_width=None,
+    case_prefix="JAC",
+):
+    """
+    Finite-difference Jacobians of nadir T/U/D for a batch of base states.
+
+    Each unique case of plan_jacobian_runs is run once with simulate_one.
+    Tsurf derivatives are analytic. T is a property of the atmosphere
+    alone, and D comes from tape5_template_down, the upward-looking path
+    from the ground (H1=h2, ANGLE 0, SURREF 0) that never sees the
+    surface. Only the surface emission term of U depends on Tsurf,
+
+        dU/dTsurf = L_surf_em(λ) · d ln B(λ, Tsurf) / dTsurf
+
+    Returns
+    -------
+    dict
+        wavelength : (n_wl,)
+        params     : tuple of parameter names
+        T, U, D    : base spectra, shape (n_base, n_wl)
+        dT, dU, dD : Jacobians, shape (n_base, n_params, n_wl)
+        n_runs     : number of MODTRAN case pairs actually run
+    """
+    plan = plan_jacobian_runs(base_states, params=params, steps=steps,
+                              scheme=scheme)
+
+    # Name runs after the sensor values actually written into the deck,
+    # as simulate_standoff_batch does
+    deck_center, deck_width = rtm_simple._deck_sensor(sensor_center,
+                                                      sensor_width)
+
+    sims = []
+    for key in plan["runs"]:
+        Tsurf, h2o, o3, h1, h2 = key
+        sims.append(
+            rtm_simple.simulate_one(
+                Tsurf,
+                _case_name(case_prefix, key, deck_center, deck_width),
+                h2o_scale=h2o,
+                o3_scale=o3,
+                h1=h1,
+                h2=h2,
+                sensor_center=sensor_center,
+                sensor_width=sensor_width,
+            )
+        )
+
+    lam = np.asarray(sims[plan["base_index"][0]]["wavelength"], dtype=float)
+    n_base = len(plan["base_index"])
+    n_par = len(plan["params"])
+    n_wl = lam.size
+
+    T = np.empty((n_base, n_wl))
+    U = np.empty((n_base, n_wl))
+    D = np.empty((n_base, n_wl))
+    dT = np.zeros((n_base, n_par, n_wl))
+    dU = np.zeros((n_base, n_par, n_wl))
+    dD = np.zeros((n_base, n_par, n_wl))
+
+    for b, i_base in enumerate(plan["base_index"]):
+        base = sims[i_base]
+        T[b] = base["transmittance"]
+        U[b] = base["up_microflicks"]
+        D[b] = base["down_microflicks"]
+
+        for p, stencil in enumerate(plan["stencils"][b]):
+            name = plan["params"][p]
+
+            if name == "Tsurf":
+                surf_em = np.asarray(base["surface_emission"], dtype=float) * 1e6
+                dU[b, p] = surf_em * planck_dlnB_dT(lam, base["T_surface"])
+                continue
+
+            i_plus, i_minus, delta = stencil
+            plus, minus = sims[i_plus], sims[i_minus]
+            dT[b, p] = (plus["transmittance"] - minus["transmittance"]) / delta
+            dU[b, p] = (plus["up_microflicks"] - minus["up_microflicks"]) / delta
+            dD[b, p] = (plus["down_microflicks"] - minus["down_microflicks"]) / delta
+
+    return {
+        "wavelength": lam,
+        "params": plan["params"],
+        "T": T,
+        "U": U,
+        "D": D,
+        "dT": dT,
+        "dU": dU,
+        "dD": dD,
+        "n_runs": len(plan["runs"]),
+    }
@@ -12,6 +12,14 @@ MODTRAN_DIR: str | None = None
 MODTRAN_EXE: str | None = None
 OUTPUTS_DIR: str | None = None
 
+# Smallest sensor width (cm^-1) build_tape5 passes to MODTRAN by default;
+# narrower values are clamped with a warning (wrapper policy, not a MODTRAN limit).
+MIN_SENSOR_WIDTH = 10.0
+
+# Finest FWHM (cm^-1) of the default 1 cm^-1 band model (FWHM >= 2 bins).
+# Used for native runs that are degraded afterwards (see convolution.py).
+NATIVE_SENSOR_WIDTH = 2.0
+
 
 def load_template(template_name: str):
     """
@@ -34,7 +42,12 @@ def build_tape5(
     sensor_center=None,
     sensor_width=None,
     range_km=None,          
+    clamp_width=True,
 ):
+    """
+    Fill a TAPE5 template. Sensor widths below MIN_SENSOR_WIDTH are
+    clamped unless clamp_width=False (native-resolution runs).
+    """
     template_path = load_template(template_name)
 
     with open(template_path, "r", encoding="latin-1", errors="replace") as f:
@@ -56,13 +69,14 @@ def build_tape5(
         txt = txt.replace("SENSOR_CENTER", f"{sensor_center:.5f}")
 
     if sensor_width is not None:
-        MIN_WIDTH = 10.0
-        if sensor_width < MIN_WIDTH:
+        if clamp_width and sensor_width < MIN_SENSOR_WIDTH:
             print(
-                f"[modtran_tud] WARNING: sensor_width={sensor_width} "
-                f"is too small for MODTRAN (cm^-1). Using {MIN_WIDTH} instead."
+                f"[modtran_tud] WARNING: sensor_width={sensor_width} cm^-1 "
+                f"is below the wrapper minimum MIN_SENSOR_WIDTH. Using "
+                f"{MIN_SENSOR_WIDTH} instead (see run_TUD_multires for "
+                f"finer resolutions)."
             )
-            width_eff = MIN_WIDTH
+            width_eff = MIN_SENSOR_WIDTH
         else:
             width_eff = sensor_width
         txt = txt.replace("SENSOR_WIDTH", f"{width_eff:.5f}")
@@ -208,6 +222,7 @@ def simulate_one(
     h2=None,
     sensor_center=None,
     sensor_width=None,
+    clamp_width=True,
 ):
     """
     Run two MODTRAN cases in nadir geometry:
@@ -218,6 +233,8 @@ def simulate_one(
     This uses the existing templates:
       - tape5_template_up
       - tape5_template_down
+
+    clamp_width=False skips the MIN_SENSOR_WIDTH clamp of build_tape5.
     """
     global MODTRAN_DIR, OUTPUTS_DIR
 
@@ -241,6 +258,7 @@ def simulate_one(
         h2=h2,
         sensor_center=sensor_center,
         sensor_width=sensor_width,
+        clamp_width=clamp_width,
     )
     tp6_up_path = run_modtran(tape5_up, f"{case_name}_UP")
     res_up = parse_tape6(tp6_up_path)
@@ -255,6 +273,7 @@ def simulate_one(
         h2=h2,
         sensor_center=sensor_center,
         sensor_width=sensor_width,
+        clamp_width=clamp_width,
     )
     tp6_down_path = run_modtran(tape5_down, f"{case_name}_DOWN")
     res_down = parse_tape6(tp6_down_path)
@@ -283,6 +302,49 @@ def simulate_one(
 # 5) Standoff line-of-sight simulation
 # -------------------------------
 
+def _run_standoff_path(case_name, h2o_scale, o3_scale, h_sensor, range_km,
+                       sensor_center, sensor_width, T_surf):
+    """
+    Horizontal path at h_sensor over range_km (tape5_template_standoff).
+    Returns (tp6_path, parsed TAPE6).
+    """
+    tape5 = build_tape5(
+        "tape5_template_standoff",
+        Tsurf=T_surf,
+        h2o_scale=h2o_scale,
+        o3_scale=o3_scale,
+        h1=h_sensor,
+        h2=h_sensor,
+        sensor_center=sensor_center,
+        sensor_width=sensor_width,
+        range_km=range_km,
+    )
+    tp6_path = run_modtran(tape5, f"{case_name}_STANDUP")
+    return tp6_path, parse_tape6(tp6_path)
+
+
+def _run_standoff_down(case_name, h2o_scale, o3_scale, h_sensor, h_ground,
+                       sensor_center, sensor_width, T_surf):
+    """
+    Down-looking path from h_sensor to a unit-albedo ground
+    (tape5_template_standoff_D). This deck has no RANGE_KM, so the
+    result does not depend on the standoff range.
+    Returns (tp6_path, parsed TAPE6).
+    """
+    tape5 = build_tape5(
+        "tape5_template_standoff_D",
+        Tsurf=T_surf,
+        h2o_scale=h2o_scale,
+        o3_scale=o3_scale,
+        h1=h_sensor,
+        h2=h_ground,
+        sensor_center=sensor_center,
+        sensor_width=sensor_width,
+    )
+    tp6_path = run_modtran(tape5, f"{case_name}_STANDD")
+    return tp6_path, parse_tape6(tp6_path)
+
+
 def simulate_standoff_TUD(
     case_name: str,
     h2o_scale: float,
@@ -329,37 +391,20 @@ def simulate_standoff_TUD(
         os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
     # ---------- 1) Horizontal standoff path: T(λ) + L_path(λ) ----------
-    tape5_up = build_tape5(
-        "tape5_template_standoff",
-        Tsurf=T_surf,
-        h2o_scale=h2o_scale,
-        o3_scale=o3_scale,
-        h1=h_sensor,
-        h2=h_sensor,
-        sensor_center=sensor_center,
-        sensor_width=sensor_width,
-        range_km=range_km,
+    tp6_up_path, res_up = _run_standoff_path(
+        case_name, h2o_scale, o3_scale, h_sensor, range_km,
+        sensor_center, sensor_width, T_surf,
     )
-    tp6_up_path = run_modtran(tape5_up, f"{case_name}_STANDUP")
-    res_up = parse_tape6(tp6_up_path)
 
     lam = res_up["wavelength"]
     T_los = res_up["transmittance"]
     U_path = res_up["total_radiance"] * 1e6  # microflicks
 
     # ---------- 2) Down-looking to ground with SURREF=1 ----------
-    tape5_down = build_tape5(
-        "tape5_template_standoff_D",
-        Tsurf=T_surf,
-        h2o_scale=h2o_scale,
-        o3_scale=o3_scale,
-        h1=h_sensor,
-        h2=h_ground,
-        sensor_center=sensor_center,
-        sensor_width=sensor_width,
+    tp6_down_path, res_down = _run_standoff_down(
+        case_name, h2o_scale, o3_scale, h_sensor, h_ground,
+        sensor_center, sensor_width, T_surf,
     )
-    tp6_down_path = run_modtran(tape5_down, f"{case_name}_STANDD")
-    res_down = parse_tape6(tp6_down_path)
 
     D_hemi = res_down["total_radiance"] * 1e6  # microflicks
 
@@ -377,3 +422,147 @@ def simulate_standoff_TUD(
         "tp6_standup": tp6_up_path,
         "tp6_standd": tp6_down_path,
     }
+
+
+# -------------------------------
+# 6) Batched standoff simulation with shared sub-runs
+# -------------------------------
+
+def _deck_sensor(sensor_center, sensor_width):
+    """
+    Sensor settings as build_tape5 writes them into the deck
+    (5 decimals, width clamped to MIN_SENSOR_WIDTH).
+    """
+    if sensor_center is not None:
+        sensor_center = round(float(sensor_center), 5)
+    if sensor_width is not None:
+        sensor_width = round(max(float(sensor_width), MIN_SENSOR_WIDTH), 5)
+    return sensor_center, sensor_width
+
+
+def _standoff_case_name(prefix, geometry, atm, second, decimals):
+    """
+    Case name for a deduplicated standoff deck, encoding its key the way
+    run_standoff_TUD builds case_name, so that separate batches do not
+    overwrite each other's TAPE6 files.
+
+    geometry = (h_sensor, range_km or h_ground), atm as in
+    simulate_standoff_batch; `second` labels the second geometry field.
+    """
+    h_sensor, value = geometry
+    h2o, o3, sensor_center, sensor_width, T_surf = atm
+    name = (
+        f"{prefix}_H{h_sensor:.6f}_{second}{value:.{decimals}f}_"
+        f"H2O{h2o:.3f}_O3{o3:.3f}_T{T_surf:.2f}"
+    )
+    if sensor_center is not None:
+        name += f"_C{sensor_center:.5f}"
+    if sensor_width is not None:
+        name += f"_W{sensor_width:.5f}"
+    return name.replace(".", "p").replace("-", "m")
+
+
+def simulate_standoff_batch(cases, case_prefix="STANDOFF"):
+    """
+    Run many standoff cases, executing each distinct MODTRAN deck only once.
+
+    Each case is a dict with the simulate_standoff_TUD arguments
+    (h2o_scale, o3_scale, h_sensor, h_ground, range_km, sensor_center,
+    sensor_width, T_surf); missing keys take the same defaults.
+
+    The downwelling deck does not depend on range_km, so it runs once per
+    (h_sensor, h_ground, h2o, o3, sensor, T_surf) combination and is shared
+    by every range. Identical horizontal-path cases are shared as well.
+
+    Returns
+    -------
+    list of dict
+        One dict per input case, in order, with the same keys as
+        simulate_standoff_TUD.
+    """
+    global MODTRAN_DIR, OUTPUTS_DIR
+
+    if MODTRAN_DIR is None:
+        raise RuntimeError(
+            "MODTRAN_DIR is not set. Use set_modtran_dir('path/to/PcModWin5/Bin') "
+            "before calling run_standoff_batch()."
+        )
+
+    if OUTPUTS_DIR is None:
+        OUTPUTS_DIR = os.path.join(MODTRAN_DIR, "outputs_tape6")
+        os.makedirs(OUTPUTS_DIR, exist_ok=True)
+
+    defaults = {
+        "h2o_scale": 1.0,
+        "o3_scale": 1.0,
+        "h_sensor": 0.0015,
+        "h_ground": 0.0,
+        "range_km": 0.1,
+        "sensor_center": None,
+        "sensor_width": None,
+        "T_surf": 1.0,
+    }
+
+    path_runs = {}
+    down_runs = {}
+    out = []
+
+    for case in cases:
+        unknown = set(case) - set(defaults)
+        if unknown:
+            raise ValueError(f"Unknown standoff case keys: {sorted(unknown)}")
+        c = {**defaults, **case}
+
+        # Keys use the values written into the TAPE5 by build_tape5
+        sensor_center, sensor_width = _deck_sensor(
+            c["sensor_center"], c["sensor_width"]
+        )
+        atm = (
+            round(c["h2o_scale"], 3),
+            round(c["o3_scale"], 3),
+            sensor_center,
+            sensor_width,
+            round(c["T_surf"], 2),
+        )
+        path_key = (round(c["h_sensor"], 6), round(c["range_km"], 3)) + atm
+        down_key = (round(c["h_sensor"], 6), round(c["h_ground"], 6)) + atm
+
+        if path_key not in path_runs:
+            name = _standoff_case_name(
+                case_prefix, path_key[:2], atm, second="R", decimals=3
+            )
+            path_runs[path_key] = _run_standoff_path(
+                name, c["h2o_scale"], c["o3_scale"], c["h_sensor"],
+                c["range_km"], c["sensor_center"], c["sensor_width"],
+                c["T_surf"],
+            )
+        if down_key not in down_runs:
+            name = _standoff_case_name(
+                case_prefix, down_key[:2], atm, second="G", decimals=6
+            )
+            down_runs[down_key] = _run_standoff_down(
+                name, c["h2o_scale"], c["o3_scale"], c["h_sensor"],
+                c["h_ground"], c["sensor_center"], c["sensor_width"],
+                c["T_surf"],
+            )
+
+        tp6_up_path, res_up = path_runs[path_key]
+        tp6_down_path, res_down = down_runs[down_key]
+
+        # copies: cases sharing a deck must not share mutable arrays
+        out.append({
+            "wavelength": res_up["wavelength"].copy(),
+            "transmittance": res_up["transmittance"].copy(),
+            "up_microflicks": res_up["total_radiance"] * 1e6,
+            "down_microflicks": res_down["total_radiance"] * 1e6,
+            "h2o_scale": c["h2o_scale"],
+            "o3_scale": c["o3_scale"],
+            "h_sensor": c["h_sensor"],
+            "h_ground": c["h_ground"],
+            "range_km": c["range_km"],
+            "T_surf": c["T_surf"],
+            "tp6_standup": tp6_up_path,
+            "tp6_standd": tp6_down_path,
+        })
+
+    return out
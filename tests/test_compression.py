@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from modtran_tud import (
+    TUDResult,
+    compress_TUD,
+    load_tud_lut,
+    query_TUD,
+    reconstruct_TUD,
+    save_tud_lut,
+)
+from modtran_tud.compression import (
+    fit_spectral_basis,
+    query_spectra,
+    reconstruct_spectra,
+)
+
+
+# Descending wavelengths, as parse_tape6 returns them
+LAM = 1e4 / np.arange(768.0, 1260.0, 4.0)
+
+
+def make_spectra(n_cases=40, rank=3, noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    modes = np.stack([np.sin(LAM * (k + 1)) for k in range(rank)])
+    coeffs = rng.normal(size=(n_cases, rank)) * [10.0, 1.0, 0.1][:rank]
+    X = 5.0 + coeffs @ modes
+    return X + noise * rng.normal(size=X.shape)
+
+
+def make_results(n_cases=20):
+    results = []
+    for h2o in np.linspace(0.5, 2.0, n_cases):
+        T = np.exp(-h2o * (0.2 + 0.1 * np.sin(LAM * 5.0)))
+        results.append(TUDResult(LAM, T, 300.0 * (1 - T), 200.0 * h2o * (1 - T),
+                                 300.0, h2o, 1.0))
+    return results
+
+
+def test_tol_selects_number_of_components():
+    X = make_spectra(rank=3)
+
+    assert fit_spectral_basis(X, tol=1e-8)["basis"].shape[0] == 3
+    # the third mode carries ~1e-4 of the variance
+    assert fit_spectral_basis(X, tol=0.1)["basis"].shape[0] == 1
+    assert fit_spectral_basis(X, n_components=2)["basis"].shape[0] == 2
+
+
+def test_rejects_negative_n_components():
+    with pytest.raises(ValueError):
+        fit_spectral_basis(make_spectra(), n_components=-1)
+
+
+@pytest.mark.parametrize("n_components", [1, 2, 5])
+def test_reconstruction_error_matches_reported_bounds(n_components):
+    X = make_spectra(noise=1e-3)
+    comp = fit_spectral_basis(X, n_components=n_components)
+    err = X - reconstruct_spectra(comp)
+
+    assert np.allclose(np.abs(err).max(axis=1), comp["max_abs_error"])
+    assert np.allclose(np.sqrt((err**2).mean(axis=1)), comp["rms_error"])
+    assert reconstruct_spectra(comp, 3) == pytest.approx(
+        reconstruct_spectra(comp)[3]
+    )
+
+
+def test_query_matches_interpolated_reconstruction():
+    comp = fit_spectral_basis(make_spectra(noise=1e-3), n_components=2)
+    full = reconstruct_spectra(comp)
+    q = np.array([LAM.min(), 8.63, 10.0, 11.7, LAM.max()])
+
+    out = query_spectra(comp, LAM, q)
+    expected = np.array([np.interp(q, LAM[::-1], row[::-1]) for row in full])
+
+    assert out.shape == (full.shape[0], q.size)
+    assert np.allclose(out, expected)
+    assert query_spectra(comp, LAM, q, index=4) == pytest.approx(expected[4])
+
+
+@pytest.mark.parametrize("q", [[100.0], [LAM.min() - 0.01], [10.0, 1.0]])
+def test_query_rejects_wavelengths_outside_grid(q):
+    comp = fit_spectral_basis(make_spectra(), n_components=2)
+    with pytest.raises(ValueError):
+        query_spectra(comp, LAM, q)
+
+
+def test_lut_roundtrip(tmp_path):
+    results = make_results()
+    lut = compress_TUD(results, tol=1e-6)
+
+    path = tmp_path / "lut.npz"
+    save_tud_lut(lut, str(path))
+    lut2 = load_tud_lut(str(path))
+
+    for i in (0, 7, 19):
+        a, b = reconstruct_TUD(lut, i), reconstruct_TUD(lut2, i)
+        assert np.array_equal(a.downwelling, b.downwelling)
+        assert b.h2o_scale == pytest.approx(results[i].h2o_scale)
+        assert np.abs(b.upwelling - results[i].upwelling).max() <= (
+            lut2.upwelling["max_abs_error"][i] + 1e-9
+        )
+
+    q = query_TUD(lut2, [9.0, 11.0], index=3)
+    assert q["transmittance"].shape == (2,)
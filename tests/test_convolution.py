@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import modtran_tud
+from modtran_tud.convolution import (
+    LINE_SHAPES,
+    convolution_matrix,
+    convolve_spectra,
+)
+
+
+# 1 cm^-1 wavenumber grid given as wavelengths, as parse_tape6 returns it
+NU = np.arange(768.0, 1260.0, 1.0)
+LAM = 1e4 / NU
+
+# Variance of each line shape in units of FWHM^2
+VARIANCE = {
+    "gaussian": 1.0 / (8.0 * np.log(2.0)),
+    "triangular": 1.0 / 6.0,
+    "rectangular": 1.0 / 12.0,
+}
+
+
+@pytest.mark.parametrize("shape", sorted(LINE_SHAPES))
+@pytest.mark.parametrize("fwhm", [10.0, 20.0])
+def test_delta_line_area_centroid_and_width(shape, fwhm):
+    j = NU.size // 2
+    delta = np.zeros(NU.size)
+    delta[j] = 1.0
+
+    out = convolve_spectra(LAM, delta, fwhm, shape=shape)
+
+    area = out.sum()
+    centroid = (out * NU).sum() / area
+    variance = (out * (NU - centroid) ** 2).sum() / area
+
+    assert area == pytest.approx(1.0, abs=1e-9)
+    assert centroid == pytest.approx(NU[j], abs=1e-6)
+    assert variance == pytest.approx(VARIANCE[shape] * fwhm**2, rel=0.05)
+
+
+@pytest.mark.parametrize("shape", sorted(LINE_SHAPES))
+def test_kernel_taps_identical_across_rows(shape):
+    K = convolution_matrix(LAM, 10.0, shape)
+    rows = range(50, NU.size - 50)
+    taps = (K[50:-50] > 0).sum(axis=1)
+
+    assert np.all(taps == taps[0])
+    # every interior row is the same kernel, centred on its own sample
+    kernels = np.array([K[i, i - 40:i + 41] for i in rows])
+    assert np.allclose(kernels, kernels[0], atol=1e-9)
+    centroid = (K[50:-50] * NU).sum(axis=1)
+    assert np.allclose(centroid, NU[50:-50], atol=1e-6)
+
+
+def test_rejects_targets_not_wider_than_native():
+    with pytest.raises(ValueError):
+        convolve_spectra(LAM, np.ones(NU.size), 2.0, native_fwhm=2.0)
+    with pytest.raises(ValueError):
+        convolve_spectra(LAM, np.ones(NU.size), 5.0, shape="lorentzian")
+
+
+def test_run_TUD_multires_validates_before_running(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("MODTRAN must not run for invalid targets")
+
+    monkeypatch.setattr(modtran_tud, "simulate_one", fail)
+
+    with pytest.raises(ValueError):
+        modtran_tud.run_TUD_multires(300.0, fwhm=[8.0, 1.0], h1=6.0, h2=0.0015)
+    with pytest.raises(ValueError):
+        modtran_tud.run_TUD_multires(300.0, fwhm=[8.0], shapes=("boxcar",),
+                                     h1=6.0, h2=0.0015)
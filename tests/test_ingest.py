@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from modtran_tud.ingest import ingest_tape6, read_tape6_cards, _ingest_one
+from modtran_tud.rtm_simple import build_tape5
+
+
+# Deck line -> echoed card label (see modtran_tud/templates)
+CARD_LABELS = ("1", "1A", "1A3", "1A4", "1A5", "2", "3", "4")
+
+RADIANCE_BLOCK = """
+ RADIANCE(WATTS/CM2-STER-XXX)
+ FREQ
+ (CM-1)
+   800.0  12.5000 180 1e-6 1e-5 0 2e-6 2e-5 0 0 3e-6 3e-5 1e-3 0.500
+   801.0  12.4844 180 1e-6 1e-5 0 2e-6 2e-5 0 0 3e-6 3e-5 1e-3 0.510
+"""
+
+
+def write_tape6(path, deck):
+    echo = "\n".join(
+        f"  CARD {label:<4}*****{line}"
+        for label, line in zip(CARD_LABELS, deck.splitlines())
+    )
+    path.write_text(" MODTRAN echo\n" + echo + "\n" + RADIANCE_BLOCK)
+    return str(path)
+
+
+@pytest.mark.parametrize("Tsurf", [1.0, 10.0, 300.0])
+@pytest.mark.parametrize(
+    "template, surref, h1, h2, range_km",
+    [
+        ("tape5_template_up",         0.0, 6.0,    0.0015, 0.0),
+        ("tape5_template_down",       0.0, 0.0015, 6.0,    0.0),
+        ("tape5_template_standoff",   0.0, 0.0015, 0.0015, 5.0),
+        ("tape5_template_standoff_D", 1.0, 0.0015, 0.0,    0.0),
+    ],
+)
+def test_read_tape6_cards_templates(tmp_path, template, surref, h1, h2,
+                                    range_km, Tsurf):
+    deck = build_tape5(
+        template,
+        Tsurf,
+        h2o_scale=1.25,
+        o3_scale=0.8,
+        h1=6.0 if template.endswith(("_up", "_down")) else 0.0015,
+        h2=0.0015 if template.endswith(("_up", "_down")) else h2,
+        sensor_center=0.0,
+        sensor_width=12.0,
+        range_km=range_km,
+    )
+    out = read_tape6_cards(write_tape6(tmp_path / "run.tp6", deck))
+
+    assert out["Tsurf"] == pytest.approx(Tsurf)
+    assert out["surref"] == pytest.approx(surref)
+    assert out["h2o_scale"] == pytest.approx(1.25)
+    assert out["o3_scale"] == pytest.approx(0.8)
+    # CARD 3 as MODTRAN reads it (observer / final altitude)
+    assert out["h1"] == pytest.approx(h1)
+    assert out["h2"] == pytest.approx(h2)
+    assert out["range_km"] == pytest.approx(range_km)
+    assert out["v1"] == pytest.approx(768.0)
+    assert out["v2"] == pytest.approx(1259.0)
+    assert out["sensor_width"] == pytest.approx(12.0)
+
+
+def test_read_tape6_cards_fixed_card4(tmp_path):
+    deck = "\n".join([""] * 7 + ["   768.000  1259.000       1.0        2.RN        A"])
+    out = read_tape6_cards(write_tape6(tmp_path / "pcmodwin.tp6", deck))
+
+    assert out["v1"] == pytest.approx(768.0)
+    assert out["v2"] == pytest.approx(1259.0)
+    assert out["sensor_center"] == pytest.approx(1.0)
+    assert out["sensor_width"] == pytest.approx(2.0)
+    assert np.isnan(out["Tsurf"])
+
+
+def test_ingest_down_maps_altitudes_to_run_TUD(tmp_path):
+    for kind, template in (("UP", "tape5_template_up"),
+                           ("DOWN", "tape5_template_down")):
+        deck = build_tape5(template, 300.0, h1=6.0, h2=0.0015,
+                           sensor_center=0.0, sensor_width=10.0)
+        _, rec = _ingest_one(write_tape6(tmp_path / f"T300_{kind}.tp6", deck))
+
+        assert rec["kind"] == kind
+        assert rec["h1"] == pytest.approx(6.0)
+        assert rec["h2"] == pytest.approx(0.0015)
+
+
+def test_read_tape6_cards_itype_with_t_best(tmp_path):
+    card1 = "TMF 6T   1    1    0    0    0    0    0    0    0    0    0    1 300.000  0.000"
+    out = read_tape6_cards(write_tape6(tmp_path / "tbest.tp6", card1))
+
+    assert out["itype"] == pytest.approx(1.0)
+    assert out["Tsurf"] == pytest.approx(300.0)
+
+
+def test_ingest_tape6_radiance_units(tmp_path):
+    deck = build_tape5("tape5_template_up", 300.0, h1=6.0, h2=0.0015,
+                       sensor_center=0.0, sensor_width=10.0)
+    write_tape6(tmp_path / "T300_UP.tp6", deck)
+    ds = ingest_tape6(tmp_path, workers=1)
+
+    # total radiance in microflicks, components as in simulate_one
+    assert ds["total_radiance"][0] == pytest.approx([30.0, 30.0])
+    assert ds["surface_emission"][0] == pytest.approx([2e-5, 2e-5])
+    assert ds["failed"] == []
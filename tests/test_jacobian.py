@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from modtran_tud import rtm_simple
+from modtran_tud.jacobian import (
+    plan_jacobian_runs,
+    planck_dlnB_dT,
+    simulate_jacobian,
+)
+
+
+BASE = {"Tsurf": 300.0, "h2o_scale": 1.0, "o3_scale": 1.0,
+        "h1": 6.0, "h2": 0.0015}
+
+
+def test_plan_forward_shares_base_and_neighbours():
+    states = [BASE, {**BASE, "h2o_scale": 1.01}]
+    plan = plan_jacobian_runs(states, params=("h2o_scale", "Tsurf"))
+
+    # base 1, base 2 (= h2o+ of base 1), h2o+ of base 2
+    assert len(plan["runs"]) == 3
+    assert plan["stencils"][0][0] == (plan["base_index"][1],
+                                      plan["base_index"][0],
+                                      pytest.approx(0.01))
+    # Tsurf is analytic: no stencil, no extra run
+    assert plan["stencils"][0][1] is None
+
+
+def test_plan_central_falls_back_to_forward_near_zero():
+    plan = plan_jacobian_runs([BASE], params=("h2",), scheme="central",
+                              steps={"h2": 0.002})
+    i_plus, i_minus, delta = plan["stencils"][0][0]
+
+    assert i_minus == plan["base_index"][0]
+    assert delta == pytest.approx(0.002)
+
+    plan = plan_jacobian_runs([BASE], params=("h2o_scale",), scheme="central")
+    i_plus, i_minus, delta = plan["stencils"][0][0]
+    assert plan["runs"][i_minus][1] == pytest.approx(0.99)
+    assert delta == pytest.approx(0.02)
+
+
+@pytest.mark.parametrize(
+    "states, kwargs",
+    [
+        ([], {}),
+        ([BASE], {"params": ("vis",)}),
+        ([BASE], {"scheme": "backward"}),
+        ([{"h2o_scale": 1.0}], {}),
+        ([{"Tsurf": 300.0}], {"params": ("h1",)}),
+        ([BASE], {"params": ("h2o_scale",), "steps": {"h2o_scale": 1e-5}}),
+    ],
+)
+def test_plan_rejects_invalid_requests(states, kwargs):
+    with pytest.raises(ValueError):
+        plan_jacobian_runs(states, **kwargs)
+
+
+def test_simulate_jacobian_names_runs_after_deck_values(monkeypatch):
+    names = []
+    lam = np.linspace(8.0, 13.0, 5)
+
+    def fake_simulate_one(Tsurf, case_name, h2o_scale, o3_scale, h1=None,
+                          h2=None, sensor_center=None, sensor_width=None):
+        names.append(case_name)
+        surf = 1e-4 * np.ones_like(lam)
+        return {
+            "wavelength": lam,
+            "transmittance": np.exp(-h2o_scale) * np.ones_like(lam),
+            "up_microflicks": surf * 1e6,
+            "down_microflicks": h2o_scale * np.ones_like(lam),
+            "surface_emission": surf,
+            "T_surface": Tsurf,
+        }
+
+    monkeypatch.setattr(rtm_simple, "simulate_one", fake_simulate_one)
+    sim = simulate_jacobian([BASE], params=("h2o_scale", "Tsurf"),
+                            sensor_center=0.0, sensor_width=5.0)
+
+    assert all(n.endswith("_W10p00000") for n in names)
+    assert len(set(names)) == sim["n_runs"] == 2
+    assert sim["dD"][0, 0] == pytest.approx(np.ones_like(lam))
+    assert sim["dU"][0, 1] == pytest.approx(100.0 * planck_dlnB_dT(lam, 300.0))